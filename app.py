@@ -1,6 +1,15 @@
-from flask import Flask, render_template, jsonify, request, Response
+import os
+from thread_limits import NATIVE_THREADS
+
+# Limit native thread pools before numpy/cv2/numba are imported
+os.environ.setdefault('OMP_NUM_THREADS', str(NATIVE_THREADS))
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
+from flask import Flask, render_template, request, Response
 from light_detector import LightBulbDetector
-import cv2
+import orjson
+import queue
 import threading
 import time
 import json
@@ -8,34 +17,84 @@ from datetime import datetime
 
 app = Flask(__name__)
 
-# Global variables
+def ojsonify(obj, etag=None):
+    """Serialize obj to a JSON response with orjson (handles numpy types natively)"""
+    response = Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+                        mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+    return response
+
+def result_etag(result, *state):
+    """ETag for a response derived from result plus any extra state it includes"""
+    return '-'.join(str(value) for value in (result.get('ts', 0) if result else 0,) + state)
+
+def not_modified(etag):
+    """Return a 304 response if the client already has etag, otherwise None"""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def _fmt_ts(ts):
+    """Format a time.time() timestamp for display"""
+    return datetime.fromtimestamp(ts).isoformat(timespec='seconds') if ts else ''
+
+# Detector owning the camera and all shared monitoring state
 detector = LightBulbDetector()
-camera_thread = None
-stop_camera = False
-latest_result = None
-debug_mode = True
+
+def capture_worker():
+    """Background thread that keeps the detector's frame queue filled with the freshest frame"""
+    while detector.running.is_set():
+        frame = detector.capture_frame()
+        if frame is None:
+            time.sleep(0.1)
+            continue
+        
+        detector.publish_stream_frame(frame)
+        
+        # Drop the previous frame if analysis has not picked it up yet
+        try:
+            detector.frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        detector.frame_queue.put_nowait(frame)
 
 def camera_worker():
     """Background thread for continuous camera monitoring"""
-    global latest_result, stop_camera
-    
-    if not detector.open_camera():
-        print("Failed to open camera in worker thread")
-        return
-    
-    while not stop_camera:
-        try:
-            result = detector.capture_and_analyze()
-            if 'error' not in result:
-                latest_result = result
-                if debug_mode:
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Detection: {result['signal']} - Score: {result['detection_summary']['decision_factors']['final_score']:.3f}")
-            time.sleep(1)  # Update every second
-        except Exception as e:
-            print(f"Error in camera worker: {e}")
-            time.sleep(2)
-    
-    detector.close_camera()
+    try:
+        if not detector.open_camera():
+            print("Failed to open camera in worker thread")
+            return
+        
+        capture_thread = threading.Thread(target=capture_worker)
+        capture_thread.daemon = True
+        capture_thread.start()
+        
+        while detector.running.is_set():
+            try:
+                frame = detector.frame_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            
+            try:
+                result = detector.analyze_frame_detailed(frame)
+                if 'error' not in result:
+                    detector.set_latest_result(result)
+                    if detector.debug_mode:
+                        print(f"[{datetime.now().strftime('%H:%M:%S')}] Detection: {result['signal']} - Score: {result['detection_summary']['decision_factors']['final_score']:.3f}")
+            except Exception as e:
+                print(f"Error in camera worker: {e}")
+                time.sleep(2)
+        
+        capture_thread.join(timeout=2)
+        detector.close_camera()
+    finally:
+        # Whatever the exit path, mark monitoring as stopped so streams end
+        # and drop its frames so a restart never serves stale ones
+        detector.running.clear()
+        detector.reset_stream_state()
 
 @app.route('/')
 def index():
@@ -45,76 +104,77 @@ def index():
 @app.route('/api/start_camera')
 def start_camera():
     """Start the camera monitoring"""
-    global camera_thread, stop_camera
+    if detector.is_worker_alive():
+        return ojsonify({'status': 'Camera already running'})
     
-    if camera_thread and camera_thread.is_alive():
-        return jsonify({'status': 'Camera already running'})
+    detector.running.set()
+    detector.worker = threading.Thread(target=camera_worker)
+    detector.worker.daemon = True
+    detector.worker.start()
     
-    stop_camera = False
-    camera_thread = threading.Thread(target=camera_worker)
-    camera_thread.daemon = True
-    camera_thread.start()
-    
-    return jsonify({'status': 'Camera started successfully'})
+    return ojsonify({'status': 'Camera started successfully'})
 
 @app.route('/api/stop_camera')
 def stop_camera_api():
     """Stop the camera monitoring"""
-    global stop_camera
-    
-    stop_camera = True
-    if camera_thread:
-        camera_thread.join(timeout=2)
+    detector.running.clear()
+    if detector.worker:
+        detector.worker.join(timeout=2)
     
-    return jsonify({'status': 'Camera stopped'})
+    return ojsonify({'status': 'Camera stopped'})
 
 @app.route('/api/status')
 def get_status():
     """Get current camera and detection status"""
-    global latest_result
+    result = detector.get_latest_result()
+    
+    # The body is built only from what the ETag covers
+    etag = result_etag(result, detector.is_camera_open, detector.camera is not None)
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
     status = {
         'camera_status': detector.get_camera_status(),
-        'latest_result': latest_result,
-        'timestamp': datetime.now().isoformat()
+        'latest_result': result
     }
     
-    return jsonify(status)
+    return ojsonify(status, etag)
 
 @app.route('/api/detect_once')
 def detect_once():
     """Perform a single detection"""
+    # The worker owns the camera while it runs; never open or read it here
+    if detector.is_worker_alive():
+        result = detector.get_latest_result()
+        if not result:
+            return ojsonify({'error': 'No detection data available yet'})
+        return ojsonify(result)
+    
     if not detector.is_camera_open:
         if not detector.open_camera():
-            return jsonify({'error': 'Failed to open camera'})
+            return ojsonify({'error': 'Failed to open camera'})
     
     result = detector.capture_and_analyze()
-    return jsonify(result)
+    return ojsonify(result)
 
 @app.route('/api/camera_feed')
 def camera_feed():
     """Stream camera feed"""
     def generate():
-        if not detector.is_camera_open:
-            if not detector.open_camera():
-                yield b''
-                return
-        
-        while True:
-            ret, frame = detector.camera.read()
-            if not ret:
-                break
-            
-            # Resize frame for web streaming
-            frame = cv2.resize(frame, (640, 480))
-            
-            # Encode frame
-            ret, buffer = cv2.imencode('.jpg', frame)
-            if not ret:
+        # Frames are captured and encoded once by the camera worker;
+        # the stream ends when the worker is not running
+        seq = 0
+        while detector.is_worker_alive():
+            new_seq, jpeg = detector.wait_for_stream_frame(seq)
+            if new_seq == seq:
                 continue
+            seq = new_seq
+            if jpeg is None:
+                continue  # Slot was reset, wait for the next frame
             
             yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
     
     return Response(generate(),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
@@ -122,84 +182,108 @@ def camera_feed():
 @app.route('/api/light_status')
 def light_status():
     """Get current light status"""
-    global latest_result
-    
-    if latest_result:
-        return jsonify({
-            'signal': latest_result.get('signal', 'UNKNOWN'),
-            'room_status': latest_result.get('room_status', 'UNKNOWN'),
-            'timestamp': latest_result.get('timestamp', ''),
-            'detected_count': len(latest_result.get('detected_light_sources', [])),
-            'decision_score': latest_result.get('detection_summary', {}).get('decision_factors', {}).get('final_score', 0)
-        })
+    result = detector.get_latest_result()
+    
+    etag = result_etag(result)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+    
+    if result:
+        return ojsonify({
+            'signal': result.get('signal', 'UNKNOWN'),
+            'room_status': result.get('room_status', 'UNKNOWN'),
+            'ts': result.get('ts', 0),
+            'detected_count': len(result.get('detected_light_sources', {}).get('x', [])),
+            'decision_score': result.get('detection_summary', {}).get('decision_factors', {}).get('final_score', 0)
+        }, etag)
     else:
-        return jsonify({
+        return ojsonify({
             'signal': 'UNKNOWN',
             'room_status': 'UNKNOWN',
-            'timestamp': '',
+            'ts': 0,
             'detected_count': 0,
             'decision_score': 0
-        })
+        }, etag)
 
 @app.route('/api/debug_info')
 def get_debug_info():
     """Get detailed debug information about the detection process"""
-    global latest_result
+    result = detector.get_latest_result()
+    history = detector.get_detection_history()
+    
+    # History can advance without latest_result (e.g. detect_once), so include its newest entry
+    camera_thread_alive = detector.is_worker_alive()
+    history_ts = history[-1]['ts'] if history else 0
+    etag = result_etag(result, history_ts, detector.is_camera_open, detector.debug_mode, camera_thread_alive)
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
     debug_data = {
         'camera_status': detector.get_camera_status(),
-        'detection_history': detector.get_detection_history(),
-        'latest_detection': latest_result,
+        'detection_history': history,
+        'latest_detection': result,
         'system_info': {
-            'timestamp': datetime.now().isoformat(),
-            'debug_mode': debug_mode,
-            'camera_thread_alive': camera_thread.is_alive() if camera_thread else False
+            'ts': time.time(),
+            'debug_mode': detector.debug_mode,
+            'camera_thread_alive': camera_thread_alive
         }
     }
     
-    return jsonify(debug_data)
+    return ojsonify(debug_data, etag)
 
 @app.route('/api/detection_details')
 def get_detection_details():
     """Get detailed information about the latest detection"""
-    global latest_result
+    result = detector.get_latest_result()
     
-    if not latest_result:
-        return jsonify({'error': 'No detection data available'})
+    if not result:
+        return ojsonify({'error': 'No detection data available'})
+    
+    etag = result_etag(result)
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
     # Extract key information for detailed view
     details = {
-        'timestamp': latest_result.get('timestamp'),
+        'timestamp': _fmt_ts(result.get('ts')),
         'final_decision': {
-            'signal': latest_result.get('signal'),
-            'room_status': latest_result.get('room_status')
+            'signal': result.get('signal'),
+            'room_status': result.get('room_status')
         },
-        'frame_analysis': latest_result.get('frame_analysis', {}),
-        'threshold_analysis': latest_result.get('threshold_analysis', {}),
-        'detection_summary': latest_result.get('detection_summary', {}),
-        'detected_light_sources': latest_result.get('detected_light_sources', [])
+        'frame_analysis': result.get('frame_analysis', {}),
+        'threshold_analysis': result.get('threshold_analysis', {}),
+        'detection_summary': result.get('detection_summary', {}),
+        'detected_light_sources': result.get('detected_light_sources', {})
     }
     
-    return jsonify(details)
+    return ojsonify(details, etag)
 
 @app.route('/api/real_time_data')
 def get_real_time_data():
     """Get real-time data for live monitoring"""
-    global latest_result
+    result = detector.get_latest_result()
+    
+    if not result:
+        return ojsonify({'error': 'No data available'})
     
-    if not latest_result:
-        return jsonify({'error': 'No data available'})
+    etag = result_etag(result)
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
     # Extract real-time monitoring data
     real_time_data = {
-        'timestamp': latest_result.get('timestamp'),
-        'signal': latest_result.get('signal'),
-        'room_status': latest_result.get('room_status'),
+        'ts': result.get('ts'),
+        'signal': result.get('signal'),
+        'room_status': result.get('room_status'),
         'metrics': {
-            'average_brightness': latest_result.get('frame_analysis', {}).get('average_brightness', 0),
-            'total_contours': latest_result.get('detection_summary', {}).get('total_contours_found', 0),
-            'area_coverage': latest_result.get('detection_summary', {}).get('area_percentage', 0),
-            'decision_score': latest_result.get('detection_summary', {}).get('decision_factors', {}).get('final_score', 0)
+            'average_brightness': result.get('frame_analysis', {}).get('average_brightness', 0),
+            'total_contours': result.get('detection_summary', {}).get('total_contours_found', 0),
+            'area_coverage': result.get('detection_summary', {}).get('area_percentage', 0),
+            'decision_score': result.get('detection_summary', {}).get('decision_factors', {}).get('final_score', 0)
         },
         'threshold_results': {
             name: {
@@ -207,20 +291,19 @@ def get_real_time_data():
                 'total_brightness': data.get('total_brightness', 0),
                 'average_brightness': data.get('average_brightness', 0)
             }
-            for name, data in latest_result.get('threshold_analysis', {}).items()
+            for name, data in result.get('threshold_analysis', {}).items()
         }
     }
     
-    return jsonify(real_time_data)
+    return ojsonify(real_time_data, etag)
 
 @app.route('/api/toggle_debug')
 def toggle_debug():
     """Toggle debug mode on/off"""
-    global debug_mode
-    debug_mode = not debug_mode
-    return jsonify({
-        'debug_mode': debug_mode,
-        'status': f'Debug mode {"enabled" if debug_mode else "disabled"}'
+    detector.debug_mode = not detector.debug_mode
+    return ojsonify({
+        'debug_mode': detector.debug_mode,
+        'status': f'Debug mode {"enabled" if detector.debug_mode else "disabled"}'
     })
 
 if __name__ == '__main__':
@@ -228,12 +311,13 @@ if __name__ == '__main__':
         print("Starting Light Bulb Detection Web Application...")
         print("Access the application at: http://localhost:5000")
         print("Debug mode is enabled by default")
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        # Threaded server so the MJPEG stream does not block status polling
+        app.run(threaded=True, host='0.0.0.0', port=5000)
     except KeyboardInterrupt:
         print("\nShutting down...")
-        stop_camera = True
-        if camera_thread:
-            camera_thread.join(timeout=2)
+        detector.running.clear()
+        if detector.worker:
+            detector.worker.join(timeout=2)
         detector.close_camera()
     except Exception as e:
         print(f"Error starting application: {e}")
@@ -1,22 +1,189 @@
 import cv2
 import numpy as np
-import imutils
+from numba import njit
 from typing import Tuple, List, Dict
 import time
 import json
+import threading
+import queue
+from collections import deque
+from thread_limits import NATIVE_THREADS
+
+# Keep OpenCV's worker pool as small as the other native pools
+cv2.setNumThreads(NATIVE_THREADS)
+cv2.setUseOptimized(True)
+
+# libjpeg-turbo is used for stream encoding when available, otherwise OpenCV's encoder
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+# Resolution frames are analyzed at
+ANALYSIS_WIDTH = 640
+ANALYSIS_HEIGHT = 480
+
+# Pixels at or above this value count as lit for the brightness score
+BRIGHT_PIXEL_THRESHOLD = 200
+
+# Brightness levels, used to derive statistics from the histogram
+_LEVELS = np.arange(256, dtype=np.float64)
+
+# JPEG quality of frames published to stream viewers
+STREAM_JPEG_QUALITY = 75
+
+# HSV threshold bounds (inclusive, same semantics as cv2.inRange)
+BRIGHT_WHITE_LOWER = (0, 0, 200)
+BRIGHT_WHITE_UPPER = (180, 30, 255)
+WARM_LIGHT_LOWER = (10, 50, 150)
+WARM_LIGHT_UPPER = (25, 255, 255)
+COOL_LIGHT_LOWER = (100, 50, 150)
+COOL_LIGHT_UPPER = (130, 255, 255)
+
+# (room_status, signal) for each score_detection() signal code
+LIGHTING_DECISIONS = (
+    ("LIGHTS_OFF", "NO"),
+    ("PARTIAL_LIGHTING", "PARTIAL"),
+    ("LIGHTS_ON", "YES")
+)
+
+# Structuring element for cleaning up threshold masks
+_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+
+THRESHOLD_DESCRIPTIONS = {
+    'bright_white': 'Bright white light (high value, low saturation)',
+    'warm_light': 'Warm/yellow light (orange-yellow hue)',
+    'cool_light': 'Cool/blue light (blue hue)'
+}
+
+@njit(fastmath=True, cache=True, boundscheck=False)
+def tri_threshold(hsv, out_bw, out_warm, out_cool):
+    """Apply all three HSV thresholds in a single pass over the image"""
+    height, width = hsv.shape[0], hsv.shape[1]
+    for y in range(height):
+        for x in range(width):
+            h = hsv[y, x, 0]
+            s = hsv[y, x, 1]
+            v = hsv[y, x, 2]
+            
+            if (BRIGHT_WHITE_LOWER[0] <= h <= BRIGHT_WHITE_UPPER[0] and
+                    BRIGHT_WHITE_LOWER[1] <= s <= BRIGHT_WHITE_UPPER[1] and
+                    BRIGHT_WHITE_LOWER[2] <= v <= BRIGHT_WHITE_UPPER[2]):
+                out_bw[y, x] = 255
+            else:
+                out_bw[y, x] = 0
+            
+            if (WARM_LIGHT_LOWER[0] <= h <= WARM_LIGHT_UPPER[0] and
+                    WARM_LIGHT_LOWER[1] <= s <= WARM_LIGHT_UPPER[1] and
+                    WARM_LIGHT_LOWER[2] <= v <= WARM_LIGHT_UPPER[2]):
+                out_warm[y, x] = 255
+            else:
+                out_warm[y, x] = 0
+            
+            if (COOL_LIGHT_LOWER[0] <= h <= COOL_LIGHT_UPPER[0] and
+                    COOL_LIGHT_LOWER[1] <= s <= COOL_LIGHT_UPPER[1] and
+                    COOL_LIGHT_LOWER[2] <= v <= COOL_LIGHT_UPPER[2]):
+                out_cool[y, x] = 255
+            else:
+                out_cool[y, x] = 0
+
+@njit(fastmath=True, cache=True, boundscheck=False)
+def brightness_histogram(gray):
+    """256-bin histogram of a grayscale image, built in a single pass"""
+    hist = np.zeros(256, np.int64)
+    for y in range(gray.shape[0]):
+        for x in range(gray.shape[1]):
+            hist[gray[y, x]] += 1
+    return hist
+
+@njit(fastmath=True, cache=True, boundscheck=False)
+def bulb_candidate_filter(areas, brightnesses, aspect_ratios):
+    """
+    Cheap light bulb checks for contours that passed the area filter
+    Returns: Boolean array, True where circularity still needs checking
+    """
+    n = areas.shape[0]
+    bulb_candidates = np.empty(n, np.bool_)
+    for i in range(n):
+        bulb_candidates[i] = (
+            areas[i] > 100 and  # Minimum size
+            brightnesses[i] > 150 and  # Minimum brightness
+            0.5 <= aspect_ratios[i] <= 2.0  # Reasonable aspect ratio
+        )
+    return bulb_candidates
+
+@njit(fastmath=True, cache=True, boundscheck=False)
+def score_detection(bright_fraction, total_area, total_pixels, n_contours):
+    """
+    Weighted lighting score from the frame and contour measurements
+    Returns: (brightness_score, area_score, contour_score, final_score, signal_code)
+    """
+    brightness_score = bright_fraction  # Share of lit pixels, already 0-1
+    area_score = min(total_area / total_pixels, 1.0)  # Normalize area coverage
+    contour_score = min(n_contours / 10.0, 1.0)  # Normalize contour count
+    
+    # Weighted decision making
+    final_score = brightness_score * 0.5 + area_score * 0.3 + contour_score * 0.2
+    
+    if final_score > 0.6:
+        signal_code = 2
+    elif final_score > 0.3:
+        signal_code = 1
+    else:
+        signal_code = 0
+    return brightness_score, area_score, contour_score, final_score, signal_code
+
+def warm_up_kernels():
+    """Compile (or load from cache) every njit kernel with the types used per frame"""
+    hsv = np.zeros((2, 2, 3), np.uint8)
+    mask = np.empty((2, 2), np.uint8)
+    tri_threshold(hsv, mask, mask.copy(), mask.copy())
+    brightness_histogram(hsv[:, :, 2])
+    bulb_candidate_filter(np.zeros(1), np.zeros(1), np.ones(1))
+    score_detection(0.0, 0.0, 1.0, 0)
 
 class LightBulbDetector:
     def __init__(self):
         self.camera = None
         self.is_camera_open = False
-        self.detection_history = []
+        self._cam_lock = threading.Lock()  # VideoCapture is not safe to use from several threads
+        self.detection_history = deque(maxlen=10)  # Compact summaries of the last 10 detections
+        self.last_detection = None
+        self._history_lock = threading.Lock()
         self.debug_info = {}
         
+        # Latest encoded JPEG shared by all stream viewers
+        self._latest_jpeg = None
+        self._jpeg_seq = 0
+        self._stream_viewers = 0  # Viewers currently waiting for a frame
+        self._jpeg_cv = threading.Condition()
+        
+        # Monitoring state shared by the camera worker and request handlers
+        self.latest_result = None
+        self._result_lock = threading.Lock()
+        self.debug_mode = True
+        self.running = threading.Event()
+        self.worker = None
+        self.frame_queue = queue.Queue(maxsize=1)  # Holds only the newest captured frame
+        
+        # Avoid a JIT compile stall on the first analyzed frame
+        warm_up_kernels()
+        
+        # Mask buffers, allocated per thread once the frame size is known so
+        # concurrent analyses (worker and request threads) never share them
+        self._buffers = threading.local()
+        
     def open_camera(self, camera_index: int = 0) -> bool:
         """Open the camera for light detection"""
         try:
             self.camera = cv2.VideoCapture(camera_index)
             if self.camera.isOpened():
+                # Ask the driver for analysis-sized frames so no resize is needed
+                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, ANALYSIS_WIDTH)
+                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, ANALYSIS_HEIGHT)
+                # Keep the driver from queueing stale frames
+                self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 self.is_camera_open = True
                 return True
             else:
@@ -26,10 +193,28 @@ class LightBulbDetector:
             print(f"Error opening camera: {e}")
             return False
     
+    def _get_mask_buffers(self, height: int, width: int):
+        """
+        Get this thread's threshold and morphology mask buffers for this frame size
+        Returns: (masks dict, morphology buffer, second morphology buffer)
+        """
+        buffers = self._buffers
+        mask_buf = getattr(buffers, 'mask_buf', None)
+        if mask_buf is None or mask_buf.shape != (height, width):
+            buffers.masks = {
+                'bright_white': np.empty((height, width), np.uint8),
+                'warm_light': np.empty((height, width), np.uint8),
+                'cool_light': np.empty((height, width), np.uint8)
+            }
+            buffers.mask_buf = np.empty((height, width), np.uint8)
+            buffers.mask_buf2 = np.empty((height, width), np.uint8)
+        return buffers.masks, buffers.mask_buf, buffers.mask_buf2
+    
     def close_camera(self):
         """Close the camera"""
         if self.camera:
-            self.camera.release()
+            with self._cam_lock:
+                self.camera.release()
         self.is_camera_open = False
     
     def analyze_frame_detailed(self, frame) -> Dict:
@@ -43,141 +228,123 @@ class LightBulbDetector:
         # Store original frame dimensions
         height, width = frame.shape[:2]
         
-        # Step 1: Convert to different color spaces for analysis
+        # Step 1: Convert to HSV for analysis
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = hsv[:, :, 2]  # V channel (max of B, G, R) serves as brightness
         
         # Step 2: Calculate overall frame statistics
+        hist = brightness_histogram(gray)
+        present_levels = np.flatnonzero(hist)
+        average_brightness = _LEVELS @ hist / gray.size
         frame_stats = {
             'dimensions': {'width': width, 'height': height},
             'total_pixels': width * height,
-            'average_brightness': np.mean(gray),
-            'brightness_std': np.std(gray),
-            'max_brightness': np.max(gray),
-            'min_brightness': np.min(gray)
+            'average_brightness': average_brightness,
+            'brightness_std': np.sqrt(max((_LEVELS * _LEVELS) @ hist / gray.size - average_brightness * average_brightness, 0.0)),
+            'max_brightness': present_levels[-1],
+            'min_brightness': present_levels[0],
+            'bright_pixel_fraction': hist[BRIGHT_PIXEL_THRESHOLD:].sum() / gray.size
         }
         
         # Step 3: HSV Analysis for light detection
-        # Define multiple threshold ranges for different types of light
-        thresholds = {
-            'bright_white': {
-                'lower': np.array([0, 0, 200]),
-                'upper': np.array([180, 30, 255]),
-                'description': 'Bright white light (high value, low saturation)'
-            },
-            'warm_light': {
-                'lower': np.array([10, 50, 150]),
-                'upper': np.array([25, 255, 255]),
-                'description': 'Warm/yellow light (orange-yellow hue)'
-            },
-            'cool_light': {
-                'lower': np.array([100, 50, 150]),
-                'upper': np.array([130, 255, 255]),
-                'description': 'Cool/blue light (blue hue)'
-            }
-        }
+        # All threshold ranges are evaluated in one pass over the HSV image
+        masks, mask_buf, mask_buf2 = self._get_mask_buffers(height, width)
+        tri_threshold(hsv, masks['bright_white'], masks['warm_light'], masks['cool_light'])
         
-        # Step 4: Apply each threshold and analyze results
+        # Step 4: Analyze each threshold mask
         threshold_results = {}
-        for threshold_name, threshold_data in thresholds.items():
-            mask = cv2.inRange(hsv, threshold_data['lower'], threshold_data['upper'])
-            
+        gray_integral = cv2.integral(gray)
+        for threshold_name, mask in masks.items():
             # Clean up mask with morphological operations
-            kernel = np.ones((5, 5), np.uint8)
-            mask_cleaned = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-            mask_cleaned = cv2.morphologyEx(mask_cleaned, cv2.MORPH_CLOSE, kernel)
+            cv2.morphologyEx(mask, cv2.MORPH_OPEN, _MORPH_KERNEL, dst=mask_buf)
+            mask_cleaned = cv2.morphologyEx(mask_buf, cv2.MORPH_CLOSE, _MORPH_KERNEL, dst=mask_buf2)
             
             # Find contours in this threshold
             contours, _ = cv2.findContours(mask_cleaned, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
-            # Analyze contours
-            valid_contours = []
-            total_area = 0
-            total_brightness = 0
+            # Filter out very small areas before measuring anything else
+            areas = np.array([cv2.contourArea(contour) for contour in contours])
+            valid_indices = np.flatnonzero(areas > 50)
+            areas = areas[valid_indices]
+            
+            # Measure the remaining contours in one batch
+            rects = np.array([cv2.boundingRect(contours[i]) for i in valid_indices], dtype=np.int64).reshape(-1, 4)
+            xs, ys, ws, hs = np.ascontiguousarray(rects.T)
+            
+            # Mean brightness of each bounding rectangle from the integral image
+            box_sums = (gray_integral[ys + hs, xs + ws] - gray_integral[ys, xs + ws]
+                        - gray_integral[ys + hs, xs] + gray_integral[ys, xs])
+            brightnesses = box_sums / (ws * hs)
+            aspect_ratios = ws / hs
+            
+            # Cheap light bulb checks; circularity is only computed for contours passing them
+            bulb_candidates = bulb_candidate_filter(areas, brightnesses, aspect_ratios)
+            
+            # Circularity of the remaining candidates
+            circularities = np.zeros(len(valid_indices))
+            for i in np.flatnonzero(bulb_candidates):
+                perimeter = cv2.arcLength(contours[valid_indices[i]], True)
+                if perimeter > 0:
+                    circularities[i] = 4 * np.pi * areas[i] / (perimeter * perimeter)
             
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > 50:  # Filter out very small areas
-                    # Get bounding rectangle
-                    x, y, w, h = cv2.boundingRect(contour)
-                    
-                    # Calculate brightness in this region
-                    roi = gray[y:y+h, x:x+w]
-                    if roi.size > 0:
-                        brightness = np.mean(roi)
-                        total_brightness += brightness
-                        total_area += area
-                        
-                        # Calculate aspect ratio and circularity
-                        aspect_ratio = w / h if h > 0 else 0
-                        perimeter = cv2.arcLength(contour, True)
-                        circularity = 4 * np.pi * area / (perimeter * perimeter) if perimeter > 0 else 0
-                        
-                        # Determine if this looks like a light bulb
-                        is_likely_bulb = (
-                            area > 100 and  # Minimum size
-                            brightness > 150 and  # Minimum brightness
-                            (0.5 <= aspect_ratio <= 2.0) and  # Reasonable aspect ratio
-                            circularity > 0.3  # Somewhat circular
-                        )
-                        
-                        valid_contours.append({
-                            'position': (x, y),
-                            'size': (w, h),
-                            'area': area,
-                            'brightness': brightness,
-                            'aspect_ratio': aspect_ratio,
-                            'circularity': circularity,
-                            'is_likely_bulb': is_likely_bulb,
-                            'threshold_type': threshold_name
-                        })
+            # Determine which contours look like a light bulb
+            is_likely_bulb = bulb_candidates & (circularities > 0.3)  # Somewhat circular
+            
+            total_area = areas.sum()
+            total_brightness = brightnesses.sum()
             
             threshold_results[threshold_name] = {
-                'description': threshold_data['description'],
+                'description': THRESHOLD_DESCRIPTIONS[threshold_name],
                 'contours_found': len(contours),
-                'valid_contours': len(valid_contours),
+                'valid_contours': len(valid_indices),
                 'total_area': total_area,
                 'total_brightness': total_brightness,
-                'average_brightness': total_brightness / len(valid_contours) if valid_contours else 0,
-                'contours': valid_contours
+                'average_brightness': total_brightness / len(valid_indices) if len(valid_indices) else 0,
+                # One array per measurement, indexed by contour
+                'contours': {
+                    'x': xs,
+                    'y': ys,
+                    'w': ws,
+                    'h': hs,
+                    'area': areas,
+                    'brightness': brightnesses,
+                    'aspect_ratio': aspect_ratios,
+                    'circularity': circularities,
+                    'is_likely_bulb': is_likely_bulb
+                }
             }
         
         # Step 5: Overall analysis and decision making
-        all_contours = []
-        total_brightness_all = 0
-        total_area_all = 0
+        contour_arrays = [result['contours'] for result in threshold_results.values()]
+        detected_light_sources = {
+            key: np.concatenate([arrays[key] for arrays in contour_arrays])
+            for key in ('x', 'y', 'w', 'h', 'brightness')
+        }
+        is_likely_bulb_all = np.concatenate([arrays['is_likely_bulb'] for arrays in contour_arrays])
+        detected_light_sources['confidence'] = ['high' if likely else 'medium' for likely in is_likely_bulb_all]
+        detected_light_sources['type'] = [
+            threshold_name
+            for threshold_name, result in threshold_results.items()
+            for _ in range(result['valid_contours'])
+        ]
         
-        for threshold_name, result in threshold_results.items():
-            all_contours.extend(result['contours'])
-            total_brightness_all += result['total_brightness']
-            total_area_all += result['total_area']
+        total_contours_all = len(is_likely_bulb_all)
+        total_brightness_all = sum(result['total_brightness'] for result in threshold_results.values())
+        total_area_all = sum(result['total_area'] for result in threshold_results.values())
         
         # Step 6: Determine room lighting status
         # Calculate weighted score based on multiple factors
-        brightness_score = frame_stats['average_brightness'] / 255.0  # Normalize to 0-1
-        area_score = min(total_area_all / (width * height), 1.0)  # Normalize area coverage
-        contour_score = min(len(all_contours) / 10.0, 1.0)  # Normalize contour count
-        
-        # Weighted decision making
-        final_score = (brightness_score * 0.5 + area_score * 0.3 + contour_score * 0.2)
-        
-        if final_score > 0.6:
-            room_status = "LIGHTS_ON"
-            signal = "YES"
-        elif final_score > 0.3:
-            room_status = "PARTIAL_LIGHTING"
-            signal = "PARTIAL"
-        else:
-            room_status = "LIGHTS_OFF"
-            signal = "NO"
+        brightness_score, area_score, contour_score, final_score, signal_code = score_detection(
+            float(frame_stats['bright_pixel_fraction']), float(total_area_all), float(width * height), total_contours_all)
+        room_status, signal = LIGHTING_DECISIONS[signal_code]
         
         # Step 7: Compile detailed results
         detailed_result = {
-            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'ts': time.time(),  # Seconds since the epoch, formatted only when displayed
             'frame_analysis': frame_stats,
             'threshold_analysis': threshold_results,
             'detection_summary': {
-                'total_contours_found': len(all_contours),
+                'total_contours_found': total_contours_all,
                 'total_brightness': total_brightness_all,
                 'total_area_covered': total_area_all,
                 'area_percentage': (total_area_all / (width * height)) * 100,
@@ -190,22 +357,18 @@ class LightBulbDetector:
             },
             'room_status': room_status,
             'signal': signal,
-            'detected_light_sources': [
-                {
-                    'position': contour['position'],
-                    'size': contour['size'],
-                    'brightness': contour['brightness'],
-                    'confidence': 'high' if contour['is_likely_bulb'] else 'medium',
-                    'type': contour['threshold_type']
-                }
-                for contour in all_contours
-            ]
+            'detected_light_sources': detected_light_sources
         }
         
-        # Store in history for debugging
-        self.detection_history.append(detailed_result)
-        if len(self.detection_history) > 10:  # Keep last 10 detections
-            self.detection_history.pop(0)
+        # Store a compact summary in history for debugging
+        with self._history_lock:
+            self.last_detection = detailed_result
+            self.detection_history.append({
+                'ts': detailed_result['ts'],
+                'signal': signal,
+                'final_score': final_score,
+                'total_contours': total_contours_all
+            })
         
         return detailed_result
     
@@ -215,13 +378,78 @@ class LightBulbDetector:
         """
         return self.analyze_frame_detailed(frame)
     
+    def capture_frame(self):
+        """Capture a single analysis-sized frame, or None if no frame is available"""
+        if not self.is_camera_open or not self.camera:
+            return None
+        
+        with self._cam_lock:
+            ret, frame = self.camera.read()
+        if not ret:
+            return None
+        
+        # Downscale (keeping the aspect ratio) if the driver ignored the
+        # requested resolution; smaller frames are analysed as they are
+        height, width = frame.shape[:2]
+        scale = min(ANALYSIS_WIDTH / width, ANALYSIS_HEIGHT / height)
+        if scale < 1:
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        
+        return frame
+    
+    def publish_stream_frame(self, frame):
+        """Encode frame once and hand it to every waiting stream viewer"""
+        with self._jpeg_cv:
+            if self._stream_viewers == 0:
+                return  # Nobody is watching, skip the encode
+        
+        if _turbo_jpeg is not None:
+            jpeg = _turbo_jpeg.encode(frame, quality=STREAM_JPEG_QUALITY, pixel_format=TJPF_BGR)
+        else:
+            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, STREAM_JPEG_QUALITY])
+            if not ret:
+                return
+            jpeg = buffer.tobytes()
+        
+        with self._jpeg_cv:
+            self._latest_jpeg = jpeg
+            self._jpeg_seq += 1
+            self._jpeg_cv.notify_all()
+    
+    def wait_for_stream_frame(self, last_seq: int, timeout: float = 1.0) -> Tuple[int, bytes]:
+        """
+        Wait until a frame newer than last_seq has been published
+        Returns: (sequence number, JPEG bytes or None)
+        """
+        with self._jpeg_cv:
+            self._stream_viewers += 1
+            try:
+                self._jpeg_cv.wait_for(lambda: self._jpeg_seq != last_seq, timeout)
+            finally:
+                self._stream_viewers -= 1
+            return self._jpeg_seq, self._latest_jpeg
+    
+    def reset_stream_state(self):
+        """Drop frames left over from a monitoring run so the next run starts clean"""
+        while True:
+            try:
+                self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+        
+        with self._jpeg_cv:
+            self._latest_jpeg = None
+            self._jpeg_seq = 0
+            self._jpeg_cv.notify_all()
+    
     def capture_and_analyze(self) -> Dict:
         """Capture a frame from camera and analyze for light bulbs"""
         if not self.is_camera_open or not self.camera:
             return {"error": "Camera not open"}
         
-        ret, frame = self.camera.read()
-        if not ret:
+        frame = self.capture_frame()
+        if frame is None:
             return {"error": "Failed to capture frame"}
         
         # Analyze the frame with detailed information
@@ -229,6 +457,20 @@ class LightBulbDetector:
         
         return result
     
+    def get_latest_result(self) -> Dict:
+        """Get the most recent result published by the camera worker"""
+        with self._result_lock:
+            return self.latest_result
+    
+    def set_latest_result(self, result: Dict):
+        """Publish a camera worker result to request handlers"""
+        with self._result_lock:
+            self.latest_result = result
+    
+    def is_worker_alive(self) -> bool:
+        """Check whether the camera worker thread is running"""
+        return self.worker is not None and self.worker.is_alive()
+    
     def get_camera_status(self) -> Dict:
         """Get current camera status"""
         return {
@@ -238,15 +480,17 @@ class LightBulbDetector:
     
     def get_detection_history(self) -> List[Dict]:
         """Get recent detection history for debugging"""
-        return self.detection_history
+        with self._history_lock:
+            return list(self.detection_history)
     
     def get_debug_info(self) -> Dict:
         """Get current debug information"""
-        return {
-            'camera_status': self.get_camera_status(),
-            'detection_history_count': len(self.detection_history),
-            'last_detection': self.detection_history[-1] if self.detection_history else None
-        }
+        with self._history_lock:
+            return {
+                'camera_status': self.get_camera_status(),
+                'detection_history_count': len(self.detection_history),
+                'last_detection': self.last_detection
+            }
 
 # Example usage and testing
 if __name__ == "__main__":
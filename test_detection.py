@@ -64,7 +64,7 @@ def test_detection_system():
             print(f"\n📋 Detection Summary:")
             print(f"  Total Contours: {summary['total_contours_found']}")
             print(f"  Area Coverage: {summary['area_percentage']:.2f}%")
-            print(f"  Light Sources: {len(result['detected_light_sources'])}")
+            print(f"  Light Sources: {len(result['detected_light_sources']['x'])}")
             
             # Show decision factors
             factors = summary['decision_factors']
@@ -93,7 +93,7 @@ def test_detection_system():
     print("-" * 30)
     history = detector.get_detection_history()
     for i, detection in enumerate(history):
-        print(f"{i+1}. {detection['timestamp']} - {detection['signal']} (Score: {detection['detection_summary']['decision_factors']['final_score']:.3f})")
+        print(f"{i+1}. {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(detection['ts']))} - {detection['signal']} (Score: {detection['final_score']:.3f})")
 
 def test_single_detection():
     """Test a single detection with full output"""
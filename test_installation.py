@@ -29,19 +29,26 @@ def test_imports():
         return False
     
     try:
-        from PIL import Image
-        print(f"✓ Pillow (PIL) imported successfully")
+        import numba
+        print(f"✓ Numba version: {numba.__version__}")
     except ImportError as e:
-        print(f"✗ Pillow import failed: {e}")
+        print(f"✗ Numba import failed: {e}")
         return False
     
     try:
-        import imutils
-        print(f"✓ Imutils imported successfully")
+        import orjson
+        print(f"✓ orjson version: {orjson.__version__}")
     except ImportError as e:
-        print(f"✗ Imutils import failed: {e}")
+        print(f"✗ orjson import failed: {e}")
         return False
     
+    try:
+        from turbojpeg import TurboJPEG
+        TurboJPEG()
+        print(f"✓ TurboJPEG loaded successfully")
+    except Exception as e:
+        print(f"! TurboJPEG unavailable, falling back to OpenCV JPEG encoding: {e}")
+    
     return True
 
 def test_camera_access():
@@ -0,0 +1,6 @@
+"""Thread pool size shared by OpenCV and OpenMP (kept free of heavy imports)"""
+import os
+
+# Small native pools so they do not oversubscribe the CPU alongside the
+# camera worker and request threads
+NATIVE_THREADS = max(1, min(2, os.cpu_count() or 1))